@@ -1,8 +1,10 @@
 """Configuration for repository assessment questions and scoring"""
 
+import sys
 from enum import Enum
-from typing import Dict, List
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple
+from dataclasses import dataclass, replace
 
 
 class RepositoryTool(str, Enum):
@@ -12,7 +14,7 @@ class RepositoryTool(str, Enum):
     AZURE_DEVOPS = "azure_devops"
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     """Individual question with weight"""
     id: str
@@ -21,7 +23,7 @@ class Question:
     importance: float = 5.0  # Default importance, will be set by LLM (1-10 scale)
 
 
-@dataclass
+@dataclass(slots=True)
 class Pillar:
     """Scoring pillar with questions"""
     name: str
@@ -29,13 +31,17 @@ class Pillar:
     questions: List[Question]
 
 
-# Question importance scoring prompt
-QUESTION_IMPORTANCE_PROMPT = """You are evaluating the importance of repository governance practices. Your task is to DIFFERENTIATE between practices - not all practices are equally important.
+class QuestionEntry(NamedTuple):
+    """Question with its pillar context"""
+    pillar_id: str
+    question: Question
+    pillar_name: str
 
-Question:
-"{question}"
 
-Rate the importance of this practice for a well-governed repository on a scale of 1-10:
+# Rubric shared by the single and bulk importance scoring prompts
+_IMPORTANCE_RUBRIC = """You are evaluating the importance of repository governance practices. Your task is to DIFFERENTIATE between practices - not all practices are equally important.
+
+Rate the importance of the given practice for a well-governed repository on a scale of 1-10:
 
 CRITICAL FOUNDATION (9-10):
 - Security vulnerabilities that could lead to breaches
@@ -58,13 +64,36 @@ NICE TO HAVE (1-3):
 - Practices with limited impact on outcomes
 - Example: Aesthetic preferences, optional tooling
 
-IMPORTANT: Be critical and specific. Most practices should NOT be 9-10. Reserve high scores for truly critical items.
-
-Respond with ONLY a single number from 1 to 10."""
+IMPORTANT: Be critical and specific. Most practices should NOT be 9-10. Reserve high scores for truly critical items."""
+
+# Question importance scoring system prompt.
+# Kept static (no interpolation) so every request shares the same prompt
+# prefix and the model server can reuse its cached prefill between calls.
+QUESTION_IMPORTANCE_SYSTEM_PROMPT = (
+    "You are an expert in software engineering governance and best practices. "
+    "Differentiate carefully between practices.\n\n"
+    + _IMPORTANCE_RUBRIC
+    + "\n\nRespond with ONLY a single number from 1 to 10."
+)
+
+# System prompt for scoring several questions in one request
+QUESTION_IMPORTANCE_BULK_SYSTEM_PROMPT = (
+    "You are an expert in software engineering governance and best practices. "
+    "Differentiate carefully between practices.\n\n"
+    + _IMPORTANCE_RUBRIC
+    + "\n\nYou will receive a JSON array of questions, each with an index \"i\" "
+    "and text \"q\". Rate every question independently.\n"
+    "Respond with ONLY a JSON object of the form "
+    "{\"scores\": [{\"i\": 0, \"importance\": 7}, ...]} "
+    "containing exactly one entry per input question."
+)
+
+# Question importance scoring prompt (only the per-question part)
+QUESTION_IMPORTANCE_PROMPT = 'Question:\n"{question}"'
 
 
 # GitHub Questions (15 questions, ~6.67 points each)
-GITHUB_QUESTIONS = [
+GITHUB_QUESTIONS = (
     "Are repositories organized using organizations and teams, with role-based access instead of individual permissions?",
     "Is branch protection enforced (mandatory PRs, minimum reviewers, status checks)?",
     "Are CODEOWNERS files used to automatically assign reviewers for critical paths?",
@@ -80,10 +109,10 @@ GITHUB_QUESTIONS = [
     "Is repository archival managed for inactive or deprecated projects?",
     "Are security alerts (Dependabot, CodeQL) actively monitored and acted upon?",
     "Is repository activity (PR cycle time, merge frequency) measured and reviewed periodically?",
-]
+)
 
 # GitLab Questions (15 questions, ~6.67 points each)
-GITLAB_QUESTIONS = [
+GITLAB_QUESTIONS = (
     "Are repositories structured using groups and subgroups aligned to teams or products?",
     "Is merge request approval rules enforced based on branch and code area?",
     "Are protected branches configured with restricted push and merge permissions?",
@@ -99,10 +128,10 @@ GITLAB_QUESTIONS = [
     "Are repository compliance checks enforced before merge?",
     "Are security scanning results reviewed before code promotion?",
     "Are repository KPIs (MR aging, review time, merge rate) tracked and improved?",
-]
+)
 
 # Azure DevOps Questions (15 questions, ~6.67 points each)
-AZURE_DEVOPS_QUESTIONS = [
+AZURE_DEVOPS_QUESTIONS = (
     "Are repositories organized using projects and teams aligned to delivery units?",
     "Are branch policies enforced (minimum reviewers, build validation, comment resolution)?",
     "Are path-based policies used for critical code areas?",
@@ -118,18 +147,18 @@ AZURE_DEVOPS_QUESTIONS = [
     "Are repo policies audited regularly for compliance?",
     "Are security issues in repos tracked and remediated systematically?",
     "Are repository metrics (PR throughput, reviewer load) used for process improvement?",
-]
+)
 
 
-def get_questions_for_tool(tool: RepositoryTool) -> Dict[str, Pillar]:
+def _build_tool_questions(tool: RepositoryTool) -> tuple[Question, ...]:
     """
-    Get predefined questions for a specific repository tool
+    Build the template questions for a tool with equal max scores
     
     Args:
         tool: The repository tool (GitHub, GitLab, or Azure DevOps)
         
     Returns:
-        Dictionary of pillar_id -> Pillar with questions
+        Tuple of questions whose max scores add up to 100
     """
     # Tool-specific questions (100 points total: 15 questions × ~6.67 points each)
     tool_questions_map = {
@@ -139,41 +168,61 @@ def get_questions_for_tool(tool: RepositoryTool) -> Dict[str, Pillar]:
     }
     
     tool_questions = tool_questions_map[tool]
-    tool_name = tool.value.replace("_", " ").title()
     
-    # Create tool-specific pillar (100 points)
+    # Equal split rounded to 2 decimals; the last question takes the remainder
+    # so the total is exactly 100 without a separate correction pass
+    points_per_question = round(100.0 / len(tool_questions), 2)
+    last_question_points = round(100.0 - points_per_question * (len(tool_questions) - 1), 2)
+    
     tool_pillar_questions = [
         Question(
-            id=f"{tool.value}_{i+1}",
+            id=sys.intern(f"{tool.value}_{i+1}"),  # Used as dict key throughout an assessment
             text=q,
-            max_score=round(100.0 / len(tool_questions), 2),
+            max_score=points_per_question if i < len(tool_questions) - 1 else last_question_points,
         )
         for i, q in enumerate(tool_questions)
     ]
     
-    # Adjust last question to ensure total is exactly 100
-    total = sum(q.max_score for q in tool_pillar_questions)
-    if abs(total - 100.0) > 0.01:
-        tool_pillar_questions[-1].max_score = round(
-            tool_pillar_questions[-1].max_score + (100.0 - total), 2
-        )
+    return tuple(tool_pillar_questions)
+
+
+# Template questions per tool, built once at import. The table itself is
+# read-only, but the Question objects are not; get_questions_for_tool hands out
+# copies because an assessment updates importance and max_score in place.
+_QUESTIONS_BY_TOOL: Mapping[RepositoryTool, tuple[Question, ...]] = MappingProxyType(
+    {tool: _build_tool_questions(tool) for tool in RepositoryTool}
+)
+
+
+def get_questions_for_tool(tool: RepositoryTool) -> Dict[str, Pillar]:
+    """
+    Get predefined questions for a specific repository tool
+    
+    Args:
+        tool: The repository tool (GitHub, GitLab, or Azure DevOps)
+        
+    Returns:
+        Dictionary of pillar_id -> Pillar with questions
+    """
+    tool_name = tool.value.replace("_", " ").title()
     
+    # Create tool-specific pillar (100 points) from fresh copies of the templates
     pillars = {
         f"{tool.value}_specific": Pillar(
             name=f"{tool_name} - Repository & Code Management",
             total_weight=100.0,
-            questions=tool_pillar_questions,
+            questions=[replace(q) for q in _QUESTIONS_BY_TOOL[tool]],
         )
     }
     
     return pillars
 
 
-def get_all_questions(pillars: Dict[str, Pillar]) -> List[tuple[str, Question, str]]:
+def get_all_questions(pillars: Dict[str, Pillar]) -> List[QuestionEntry]:
     """Get all questions with their pillar context"""
     questions = []
     for pillar_id, pillar in pillars.items():
         for question in pillar.questions:
-            questions.append((pillar_id, question, pillar.name))
+            questions.append(QuestionEntry(pillar_id, question, pillar.name))
     return questions
 
@@ -5,11 +5,16 @@ from typing import Dict, Optional
 
 from repo_scorer.services.ollama_service import OllamaService
 from repo_scorer.config import (
+    Question,
+    QuestionEntry,
     RepositoryTool,
     get_questions_for_tool,
     get_all_questions,
 )
 
+# Fallback importance scores by question position (varied distribution)
+DEFAULT_IMPORTANCE_SCORES = [7.0, 8.0, 6.0, 9.0, 5.0, 7.5, 6.5, 8.5, 4.0, 7.0, 6.0, 8.0, 5.5, 7.5, 6.5]
+
 
 class AssessmentOrchestrator:
     """Orchestrates the assessment flow"""
@@ -23,6 +28,15 @@ class AssessmentOrchestrator:
         # Load predefined questions for the selected tool
         self.pillars = get_questions_for_tool(tool)
         self.questions = get_all_questions(self.pillars)
+        # question_id -> (pillar_id, question, pillar_name) for O(1) lookups
+        self.question_index: Dict[str, QuestionEntry] = {
+            entry.question.id: entry for entry in self.questions
+        }
+    
+    def find_question(self, question_id: str) -> Optional[Question]:
+        """Get a question by ID, or None if it doesn't exist"""
+        entry = self.question_index.get(question_id)
+        return entry.question if entry else None
     
     async def score_question_importance(self, question_id: str) -> float:
         """
@@ -34,37 +48,33 @@ class AssessmentOrchestrator:
         Returns:
             Importance score (1-10)
         """
+        question_obj = self.find_question(question_id)
+        
         # Check if already scored
-        if question_id in self.scored_questions:
-            # Find the question to get its current importance
-            for pillar_id, pillar in self.pillars.items():
-                for question in pillar.questions:
-                    if question.id == question_id:
-                        print(f"   ℹ️  Using cached importance score: {question.importance}/10")
-                        return question.importance
-        
-        # Find the question
-        question_obj = None
-        for pillar_id, pillar in self.pillars.items():
-            for question in pillar.questions:
-                if question.id == question_id:
-                    question_obj = question
-                    break
-            if question_obj:
-                break
+        if question_obj and question_id in self.scored_questions:
+            print(f"   ℹ️  Using cached importance score: {question_obj.importance}/10")
+            return question_obj.importance
         
         if not question_obj:
             print(f"   ⚠️  Question {question_id} not found")
             return 6.0
         
-        print(f"\n🔍 Scoring Question Importance...")
-        print(f"   Question: {question_obj.text[:80]}..." if len(question_obj.text) > 80 else f"   Question: {question_obj.text}")
-        print(f"   Current max score: {question_obj.max_score} points")
+        question_preview = (
+            f"{question_obj.text[:80]}..." if len(question_obj.text) > 80 else question_obj.text
+        )
+        print(
+            f"\n🔍 Scoring Question Importance...\n"
+            f"   Question: {question_preview}\n"
+            f"   Current max score: {question_obj.max_score} points"
+        )
         
         # Default score based on question position (varied distribution)
-        default_scores = [7.0, 8.0, 6.0, 9.0, 5.0, 7.5, 6.5, 8.5, 4.0, 7.0, 6.0, 8.0, 5.5, 7.5, 6.5]
         question_index = len(self.scored_questions)
-        default_score = default_scores[question_index] if question_index < len(default_scores) else 6.0
+        default_score = (
+            DEFAULT_IMPORTANCE_SCORES[question_index]
+            if question_index < len(DEFAULT_IMPORTANCE_SCORES)
+            else 6.0
+        )
         
         # Score with LLM
         importance = await self.ollama.score_question_importance(
@@ -82,12 +92,51 @@ class AssessmentOrchestrator:
         # This ensures the display always shows LLM-calculated weights, not hardcoded values
         self._recalculate_max_scores()
         
-        print(f"   ✅ Importance Score: {importance}/10")
-        print(f"   Updated max score: {question_obj.max_score:.2f} points\n")
+        print(
+            f"   ✅ Importance Score: {importance}/10\n"
+            f"   Updated max score: {question_obj.max_score:.2f} points\n"
+        )
         
         return importance
+
+    async def score_all_question_importance(self, max_concurrency: Optional[int] = None) -> None:
+        """
+        Score importance for every unscored question in one bulk LLM request
+
+        Args:
+            max_concurrency: Maximum in-flight requests for the per-question fallback
+                (default: OLLAMA_MAX_CONCURRENCY)
+        """
+        pending = [
+            (index, question)
+            for index, (_, question, _) in enumerate(self.questions)
+            if question.id not in self.scored_questions
+        ]
+        if not pending:
+            return
+
+        print(f"\n🔍 Scoring importance for {len(pending)} questions...")
+
+        items = [
+            (
+                question.text,
+                DEFAULT_IMPORTANCE_SCORES[index]
+                if index < len(DEFAULT_IMPORTANCE_SCORES)
+                else 6.0,
+            )
+            for index, question in pending
+        ]
+        importances = await self.ollama.score_questions_importance_bulk(
+            items, max_concurrency=max_concurrency
+        )
+
+        for (_, question), importance in zip(pending, importances):
+            question.importance = importance
+            self.scored_questions.add(question.id)
+
+        self._recalculate_max_scores()
     
-    def _recalculate_max_scores(self) -> None:
+    def _recalculate_max_scores(self) -> float:
         """
         Recalculate max_scores for all questions based on their importance weights.
         This is called after each question importance is scored to keep distribution current.
@@ -95,70 +144,71 @@ class AssessmentOrchestrator:
         For questions not yet scored:
         - If no questions scored yet: use equal distribution (100/total)
         - If some scored: unscored questions get average importance of scored ones
+        
+        Returns:
+            Total importance across all questions after the update
         """
-        all_questions = []
-        scored_questions = []
+        # self.questions is already the flat list of every pillar's questions
+        all_questions = [entry.question for entry in self.questions]
         unscored_questions = []
+        scored_count = 0
+        scored_importance = 0.0
+        
+        # Categorize by scoring status and sum scored importance in one pass
+        for question in all_questions:
+            if question.id in self.scored_questions:
+                scored_count += 1
+                scored_importance += question.importance
+            else:
+                unscored_questions.append(question)
         
-        # Collect questions and categorize by scoring status
-        for pillar_id, pillar in self.pillars.items():
-            for question in pillar.questions:
-                all_questions.append(question)
-                if question.id in self.scored_questions:
-                    scored_questions.append(question)
-                else:
-                    unscored_questions.append(question)
-        
-        if not scored_questions:
+        if not scored_count:
             # No questions scored yet - use equal distribution
+            total_importance = sum(q.importance for q in all_questions)
             points_per_question = 100.0 / len(all_questions)
             for question in all_questions:
                 question.max_score = points_per_question
         else:
             # Some questions are scored
             # For unscored questions, estimate importance as average of scored questions
-            avg_importance = sum(q.importance for q in scored_questions) / len(scored_questions)
+            avg_importance = scored_importance / scored_count
             for question in unscored_questions:
                 question.importance = avg_importance
             
             # Now distribute 100 points proportionally based on all importance values
-            total_importance = sum(q.importance for q in all_questions)
+            total_importance = scored_importance + avg_importance * len(unscored_questions)
             
             if total_importance > 0:
+                points_per_importance = 100.0 / total_importance
                 for question in all_questions:
-                    question.max_score = (question.importance / total_importance) * 100.0
+                    question.max_score = question.importance * points_per_importance
             else:
                 # Fallback: equal distribution
                 points_per_question = 100.0 / len(all_questions)
                 for question in all_questions:
                     question.max_score = points_per_question
         
-        # Refresh questions list
-        self.questions = get_all_questions(self.pillars)
+        # No need to rebuild self.questions: its entries reference these same
+        # Question objects, which were updated in place above
         
-        print(f"   📊 Recalculated scores - {len(scored_questions)}/{len(all_questions)} questions scored")
+        print(f"   📊 Recalculated scores - {scored_count}/{len(all_questions)} questions scored")
+        
+        return total_importance
     
     def normalize_question_scores(self) -> None:
         """
         Final normalization of question max_scores (called at assessment completion).
         By this point, all questions should have their importance scored.
         """
-        # Just call the internal recalculation method
-        self._recalculate_max_scores()
-        
-        # Collect all questions for summary
-        all_questions = []
-        total_importance = 0.0
-        
-        for pillar_id, pillar in self.pillars.items():
-            for question in pillar.questions:
-                all_questions.append(question)
-                total_importance += question.importance
-        
-        print("\n📊 Final Score Normalization Complete")
-        print(f"   Total importance: {total_importance:.2f}")
-        print(f"   Points distributed: 100.0")
-        print(f"   Questions: {len(all_questions)}\n")
+        # The recalculation already walks every question, so reuse its totals
+        total_importance = self._recalculate_max_scores()
+        
+        print(
+            "\n📊 Final Score Normalization Complete\n"
+            f"   Total importance: {total_importance:.2f}\n"
+            "   Points distributed: 100.0\n"
+            f"   Questions: {len(self.questions)}\n"
+        )
 
     async def check_readiness(self) -> tuple[bool, str]:
         """
@@ -178,5 +228,5 @@ class AssessmentOrchestrator:
                 f"Model '{self.ollama.model}' not found. Run: ollama pull {self.ollama.model}",
             )
         
-        print("\n✅ System ready - questions will be scored as you progress through the assessment\n")
+        print("\n✅ System ready - question importance will be scored before the assessment starts\n")
         return True, "System ready"
@@ -0,0 +1,73 @@
+"""In-memory LRU + TTL cache for LLM responses"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def make_cache_key(model: str, system: str, prompt: str, options: Dict[str, Any]) -> str:
+    """
+    Build a stable cache key for an LLM request
+
+    Args:
+        model: Model name the request is sent to
+        system: System prompt
+        prompt: User prompt
+        options: Generation options (temperature, num_predict, ...)
+
+    Returns:
+        SHA-256 hex digest of the request parameters
+    """
+    payload = json.dumps(
+        {"model": model, "system": system, "prompt": prompt, "options": options},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Thread-safe LRU cache with per-entry expiry for LLM response text"""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 24 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared across OllamaService instances (one per Streamlit session)
+response_cache = LLMResponseCache()
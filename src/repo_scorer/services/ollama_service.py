@@ -1,9 +1,12 @@
 """Ollama service for LLM interactions"""
 
 import asyncio
-import os
-from typing import Optional
-from dotenv import load_dotenv
+import json
+import random
+import re
+import threading
+import time
+from typing import List, Optional
 
 try:
     import ollama
@@ -12,10 +15,98 @@ except ImportError:
         "ollama package not found. Please install: pip install ollama"
     )
 
-from repo_scorer.config import QUESTION_IMPORTANCE_PROMPT
+from repo_scorer.config import (
+    QUESTION_IMPORTANCE_BULK_SYSTEM_PROMPT,
+    QUESTION_IMPORTANCE_PROMPT,
+    QUESTION_IMPORTANCE_SYSTEM_PROMPT,
+)
+from repo_scorer.services.llm_cache import make_cache_key, response_cache
+from repo_scorer.settings import get_settings
 
-# Load environment variables
-load_dotenv()
+# Generation options for importance scoring. Deterministic mode makes repeat
+# requests reproducible, so cached responses replay the same score.
+DETERMINISTIC_OPTIONS = {"temperature": 0, "top_p": 1, "seed": 42}
+SAMPLED_OPTIONS = {"temperature": 0.3}
+
+# Structured output schema for bulk importance scoring. The server constrains
+# decoding to this shape, so replies are always parseable JSON with in-range scores.
+IMPORTANCE_BULK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scores": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "i": {"type": "integer"},
+                    "importance": {"type": "integer", "minimum": 1, "maximum": 10},
+                },
+                "required": ["i", "importance"],
+            },
+        },
+    },
+    "required": ["scores"],
+}
+
+# Patterns for pulling a 1-10 score out of free-form LLM output
+_INTEGER_SCORE_RE = re.compile(r'\b([1-9]|10)\b')
+_DECIMAL_SCORE_RE = re.compile(r'\b(10|[1-9](?:\.\d+)?)\b')
+
+# Ollama status codes worth retrying (server busy / model still loading)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503}
+
+
+def _preview(text: str, width: int = 40) -> str:
+    """Shorten question text to tag console log lines"""
+    return f"{text[:width]}..." if len(text) > width else text
+
+
+class _CircuitBreaker:
+    """
+    Fail fast while Ollama is unreachable
+
+    Opens after ``threshold`` consecutive failures; while open, callers skip
+    the LLM and use their fallback scores. Once per ``cooldown`` seconds a
+    single probe call is let through (half-open); its outcome closes the
+    breaker or keeps it open.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Check whether calls should be short-circuited"""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            now = time.monotonic()
+            if now - self.opened_at >= self.cooldown:
+                # Cooldown over: let this call through as the probe and restart the
+                # cooldown, so everyone else stays short-circuited until it reports back
+                self.opened_at = now
+                return False
+            return True
+
+    def record_success(self) -> None:
+        """Reset after Ollama answers"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold"""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+# Shared across OllamaService instances, since they all talk to the same server
+_breaker = _CircuitBreaker()
 
 
 class OllamaService:
@@ -25,18 +116,39 @@ class OllamaService:
         self,
         model: Optional[str] = None,
         host: Optional[str] = None,
-        timeout: int = 60,
+        timeout: Optional[int] = None,
+        enable_cache: bool = True,
+        max_retries: int = 2,
+        max_concurrency: Optional[int] = None,
     ):
-        self.model = model or os.getenv("OLLAMA_MODEL", "phi-3:mini")
-        self.host = host or os.getenv("OLLAMA_HOST", "http://localhost:11434")
-        self.timeout = timeout or int(os.getenv("OLLAMA_TIMEOUT", "60"))
-        # Don't create client here - create fresh for each operation to avoid event loop issues
-        self._client = None
+        settings = get_settings()
+        self.model = model or settings.ollama_model
+        self.host = host or settings.ollama_host
+        self.timeout = timeout or settings.ollama_timeout
+        self.enable_cache = enable_cache
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency or settings.ollama_max_concurrency
+        # Kept alive between requests so connections are reused. The underlying
+        # httpx client is bound to the loop it was created on.
+        self._client: Optional[ollama.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
     
-    def _get_client(self):
-        """Get or create a fresh AsyncClient for the current event loop"""
-        # Always create a fresh client to avoid event loop binding issues
-        return ollama.AsyncClient(host=self.host)
+    def _get_client(self) -> ollama.AsyncClient:
+        """Get this service's AsyncClient, creating a new one if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # A client from another loop can't be used or closed here; dropping it
+            # lets it be collected together with its loop
+            self._client = ollama.AsyncClient(host=self.host)
+            self._client_loop = loop
+        return self._client
+
+    async def close(self) -> None:
+        """Close the AsyncClient and its connections"""
+        client, loop = self._client, self._client_loop
+        self._client = self._client_loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.close()
 
     async def check_health(self) -> tuple[bool, bool]:
         """
@@ -46,7 +158,7 @@ class OllamaService:
             (ollama_connected, model_available)
         """
         try:
-            # Try to list models with fresh client
+            # Try to list models
             client = self._get_client()
             models = await client.list()
             
@@ -79,7 +191,52 @@ class OllamaService:
             print(f"Ollama health check failed: {e}")
             return False, False
 
-    async def score_question_importance(self, question_text: str, default_score: float = 5.0) -> float:
+    @staticmethod
+    def _backoff_delay(attempt: int, cap: float = 30.0) -> float:
+        """
+        Full-jitter exponential backoff delay
+
+        Randomizing over the whole window keeps concurrent callers that failed
+        together from retrying in lockstep.
+
+        Args:
+            attempt: Zero-based retry attempt
+            cap: Upper bound for the backoff window in seconds
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        return random.uniform(0, min(2 ** attempt, cap))
+
+    @staticmethod
+    def _parse_importance(importance_text: str) -> Optional[float]:
+        """
+        Extract an importance score from raw LLM output
+
+        Args:
+            importance_text: Stripped LLM response text
+
+        Returns:
+            Score clamped to 1.0-10.0, or None if no number was found
+        """
+        # Try to extract first number found
+        match = _INTEGER_SCORE_RE.search(importance_text)
+        if match:
+            return max(1.0, min(10.0, float(match.group(1))))
+
+        # If no number found, try parsing decimal numbers as well
+        match = _DECIMAL_SCORE_RE.search(importance_text)
+        if match:
+            return max(1.0, min(10.0, float(match.group(1))))
+
+        return None
+
+    async def score_question_importance(
+        self,
+        question_text: str,
+        default_score: float = 5.0,
+        deterministic: bool = True,
+    ) -> float:
         """
         Score the importance of a question using LLM
         
@@ -89,71 +246,266 @@ class OllamaService:
         Args:
             question_text: The question to evaluate
             default_score: Fallback score if LLM fails (default: 5.0)
+            deterministic: Use greedy decoding with a fixed seed (default: True)
             
         Returns:
             Importance score from 1.0 to 10.0
         """
         prompt = QUESTION_IMPORTANCE_PROMPT.format(question=question_text)
+        system = QUESTION_IMPORTANCE_SYSTEM_PROMPT
+        if deterministic:
+            options = {**DETERMINISTIC_OPTIONS, "num_predict": 6}  # A number is 1-2 tokens
+        else:
+            options = {
+                **SAMPLED_OPTIONS,   # Slightly higher to get more varied responses
+                "num_predict": 10,   # Allow a bit more tokens for number + reasoning
+            }
+        cache_key = make_cache_key(self.model, system, prompt, options)
+        # Concurrent fallback calls share the console, so each line names its question
+        label = _preview(question_text)
+
+        cached_text = response_cache.get(cache_key) if self.enable_cache else None
+        if cached_text is not None:
+            importance = self._parse_importance(cached_text)
+            if importance is not None:
+                print(
+                    f"   ⚡ Cached LLM Response [{label}]: '{cached_text}'\n"
+                    f"   ✨ Parsed Score [{label}]: {importance}/10"
+                )
+                return importance
         
-        print(f"   🤖 Sending request to LLM ({self.model})...")
-        print(f"   ⏱️  Timeout: 15 seconds")
+        if _breaker.is_open():
+            print(f"   ⚡ Ollama unavailable (circuit open) [{label}], using default score: {default_score}/10")
+            return default_score
         
-        # Retry only once for faster processing
-        for attempt in range(1):
+        print(
+            f"   🤖 Sending request to LLM ({self.model}) [{label}]...\n"
+            "   ⏱️  Timeout: 15 seconds"
+        )
+        
+        # Retry transient server errors with jittered backoff, within the overall timeout budget
+        deadline = time.monotonic() + self.timeout
+        for attempt in range(self.max_retries + 1):
             try:
                 client = self._get_client()
                 response = await asyncio.wait_for(
                     client.generate(
                         model=self.model,
                         prompt=prompt,
-                        system="You are an expert in software engineering governance and best practices. Differentiate carefully between practices.",
+                        system=system,
                         stream=False,
-                        options={
-                            "temperature": 0.3,  # Slightly higher to get more varied responses
-                            "num_predict": 10,   # Allow a bit more tokens for number + reasoning
-                        },
+                        options=options,
                     ),
                     timeout=15,  # Reduced timeout for faster processing
                 )
+                _breaker.record_success()
                 
                 # Extract the number from response
                 importance_text = response["response"].strip()
-                print(f"   📥 LLM Response: '{importance_text}'")
-                
-                # Try to extract first number found
-                import re
-                numbers = re.findall(r'\b([1-9]|10)\b', importance_text)
-                if numbers:
-                    importance = float(numbers[0])
-                    # Ensure it's in valid range
-                    importance = max(1.0, min(10.0, importance))
-                    print(f"   ✨ Parsed Score: {importance}/10")
-                    return importance
+                print(f"   📥 LLM Response [{label}]: '{importance_text}'")
                 
-                # If no number found, try parsing decimal numbers as well
-                decimal_numbers = re.findall(r'\b(10|[1-9](?:\.\d+)?)\b', importance_text)
-                if decimal_numbers:
-                    importance = float(decimal_numbers[0])
-                    importance = max(1.0, min(10.0, importance))
-                    print(f"   ✨ Parsed Score: {importance}/10")
+                importance = self._parse_importance(importance_text)
+                if importance is not None:
+                    # Only cache responses that produced a usable score
+                    if self.enable_cache:
+                        response_cache.set(cache_key, importance_text)
+                    print(f"   ✨ Parsed Score [{label}]: {importance}/10")
                     return importance
                 
                 # If no number found, use default
-                print(f"   ⚠️  Could not parse LLM response, using default: {default_score}")
+                print(f"   ⚠️  Could not parse LLM response [{label}], using default: {default_score}")
                 return default_score
                     
             except asyncio.TimeoutError:
-                print(f"   ⏱️  Timeout (15s exceeded)")
-                print(f"   ⚠️  Using default score: {default_score}/10")
+                _breaker.record_failure()
+                print(
+                    f"   ⏱️  Timeout (15s exceeded) [{label}]\n"
+                    f"   ⚠️  Using default score: {default_score}/10"
+                )
                 return default_score
             except KeyError as e:
-                print(f"   ❌ Invalid response structure: {e}")
-                print(f"   ⚠️  Using default score: {default_score}/10")
+                print(
+                    f"   ❌ Invalid response structure [{label}]: {e}\n"
+                    f"   ⚠️  Using default score: {default_score}/10"
+                )
+                return default_score
+            except ollama.ResponseError as e:
+                backoff_time = self._backoff_delay(attempt)
+                if (
+                    e.status_code in RETRYABLE_STATUS_CODES
+                    and attempt < self.max_retries
+                    and time.monotonic() + backoff_time < deadline
+                ):
+                    print(f"   🔁 Ollama busy ({e.status_code}) [{label}], retrying in {backoff_time:.1f}s")
+                    await asyncio.sleep(backoff_time)
+                    continue
+                _breaker.record_failure()
+                print(
+                    f"   ❌ Error [{label}]: {e}\n"
+                    f"   ⚠️  Using default score: {default_score}/10"
+                )
                 return default_score
             except Exception as e:
-                print(f"   ❌ Error: {e}")
-                print(f"   ⚠️  Using default score: {default_score}/10")
+                _breaker.record_failure()
+                print(
+                    f"   ❌ Error [{label}]: {e}\n"
+                    f"   ⚠️  Using default score: {default_score}/10"
+                )
                 return default_score
         
         # Fallback if all attempts failed
         return default_score
+
+    async def score_questions_importance(
+        self,
+        items: List[tuple[str, float]],
+        max_concurrency: Optional[int] = None,
+        deterministic: bool = True,
+    ) -> List[float]:
+        """
+        Score the importance of several questions concurrently
+
+        All requests are submitted up front and collected together, so the
+        wall time is close to the slowest single call instead of the sum.
+
+        Args:
+            items: List of (question_text, default_score) pairs
+            max_concurrency: Maximum number of in-flight LLM requests
+                (default: the service's max_concurrency)
+            deterministic: Use greedy decoding with a fixed seed (default: True)
+
+        Returns:
+            Importance scores in the same order as ``items``
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _score_one(question_text: str, default_score: float) -> float:
+            async with semaphore:
+                return await self.score_question_importance(
+                    question_text,
+                    default_score=default_score,
+                    deterministic=deterministic,
+                )
+
+        return await asyncio.gather(
+            *[_score_one(text, default) for text, default in items]
+        )
+
+    async def score_questions_importance_bulk(
+        self,
+        items: List[tuple[str, float]],
+        max_concurrency: Optional[int] = None,
+        deterministic: bool = True,
+    ) -> List[float]:
+        """
+        Score the importance of several questions in a single LLM request
+
+        The rubric is sent once instead of once per question. Any question the
+        model skips or answers with an unusable score is re-scored on its own.
+
+        Args:
+            items: List of (question_text, default_score) pairs
+            max_concurrency: Maximum in-flight requests for the per-question fallback
+                (default: the service's max_concurrency)
+            deterministic: Use greedy decoding with a fixed seed (default: True)
+
+        Returns:
+            Importance scores in the same order as ``items``
+        """
+        if not items:
+            return []
+
+        scores: List[Optional[float]] = [None] * len(items)
+        options = DETERMINISTIC_OPTIONS if deterministic else SAMPLED_OPTIONS
+        cache_keys = [
+            make_cache_key(self.model, QUESTION_IMPORTANCE_BULK_SYSTEM_PROMPT, text, options)
+            for text, _ in items
+        ]
+        if self.enable_cache:
+            for i, key in enumerate(cache_keys):
+                cached_text = response_cache.get(key)
+                if cached_text is not None:
+                    scores[i] = float(cached_text)
+
+        uncached = [i for i, score in enumerate(scores) if score is None]
+        if not uncached:
+            print(f"   ⚡ Using cached importance scores for {len(items)} questions")
+            return scores
+
+        # Compact separators: no whitespace tokens in the per-request part of the prompt
+        prompt = json.dumps(
+            [{"i": i, "q": items[i][0]} for i in uncached], separators=(",", ":")
+        )
+        requested = set(uncached)
+
+        if _breaker.is_open():
+            print("   ⚡ Ollama unavailable (circuit open), using default scores")
+            for i in uncached:
+                scores[i] = items[i][1]
+            return scores
+
+        print(f"   🤖 Sending bulk request for {len(uncached)} questions to LLM ({self.model})...")
+
+        raw_text: Optional[str] = None
+        try:
+            client = self._get_client()
+            response = await asyncio.wait_for(
+                client.generate(
+                    model=self.model,
+                    prompt=prompt,
+                    system=QUESTION_IMPORTANCE_BULK_SYSTEM_PROMPT,
+                    stream=False,
+                    format=IMPORTANCE_BULK_SCHEMA,
+                    options={
+                        **options,
+                        # ~14 tokens per entry with digit-level tokenizers, plus
+                        # headroom for the wrapper and any whitespace the model emits
+                        "num_predict": 32 * len(uncached) + 32,
+                    },
+                ),
+                timeout=self.timeout,
+            )
+            _breaker.record_success()
+
+            raw_text = response["response"]
+            entries = json.loads(raw_text).get("scores", [])
+            for entry in entries:
+                index = entry.get("i")
+                importance = entry.get("importance")
+                if (
+                    index in requested
+                    and isinstance(importance, (int, float))
+                    and 1 <= importance <= 10
+                ):
+                    scores[index] = float(importance)
+                    if self.enable_cache:
+                        response_cache.set(cache_keys[index], str(float(importance)))
+
+            scored = [i for i in uncached if scores[i] is not None]
+            if scored:
+                print("\n".join(
+                    f"   ✨ Parsed Score [{_preview(items[i][0])}]: {scores[i]}/10" for i in scored
+                ))
+        except asyncio.TimeoutError:
+            _breaker.record_failure()
+            print(f"   ⏱️  Bulk request timed out ({self.timeout}s exceeded)")
+        except (KeyError, AttributeError, TypeError, ValueError) as e:
+            print(f"   ❌ Invalid bulk response: {e}")
+        except Exception as e:
+            _breaker.record_failure()
+            print(f"   ❌ Error: {e}")
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            if raw_text is not None:
+                print(f"   📥 Bulk LLM Response: {raw_text!r}")
+            print(f"   ⚠️  Re-scoring {len(missing)} questions individually")
+            fallback = await self.score_questions_importance(
+                [items[i] for i in missing],
+                max_concurrency=max_concurrency,
+                deterministic=deterministic,
+            )
+            for i, importance in zip(missing, fallback):
+                scores[i] = importance
+
+        return scores
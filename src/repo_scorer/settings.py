@@ -0,0 +1,35 @@
+"""Application settings loaded once from the environment and .env file"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Ollama connection settings"""
+    ollama_host: str
+    ollama_model: str
+    ollama_timeout: int
+    ollama_max_concurrency: int
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings on first use and reuse them for the rest of the process
+
+    Returns:
+        Settings built from environment variables (.env values included)
+    """
+    load_dotenv()
+    return Settings(
+        ollama_host=os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+        ollama_model=os.getenv("OLLAMA_MODEL", "phi-3:mini"),
+        ollama_timeout=int(os.getenv("OLLAMA_TIMEOUT", "60")),
+        # Match the server's OLLAMA_NUM_PARALLEL; extra requests just queue
+        # there and eat into each call's timeout
+        ollama_max_concurrency=int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2")),
+    )
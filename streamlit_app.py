@@ -6,6 +6,8 @@ Modern, responsive UI with real-time scoring and visualization
 import streamlit as st
 import asyncio
 import sys
+from bisect import bisect_right
+from collections import defaultdict
 from pathlib import Path
 import plotly.graph_objects as go
 import plotly.express as px
@@ -20,6 +22,29 @@ if str(src_path) not in sys.path:
 from repo_scorer.orchestrator import AssessmentOrchestrator
 from repo_scorer.config import RepositoryTool
 
+# Score tiers: bisect_right over the thresholds gives the tier index (score >= threshold moves up)
+SCORE_TIER_THRESHOLDS = (40, 60, 80)
+SCORE_CLASSES = ("score-poor", "score-fair", "score-good", "score-excellent")
+SCORE_LABELS = ("NEEDS IMPROVEMENT", "FAIR", "GOOD", "EXCELLENT")
+SCORE_DESCRIPTIONS = (
+    "Significant improvement needed. Focus on establishing fundamental practices.",
+    "Moderate implementation. Consider prioritizing critical governance practices.",
+    "Good foundation established. Continue refining practices for optimal governance.",
+    "Excellent performance. Your repository demonstrates strong adherence to industry best practices.",
+)
+
+# Question priority tiers, looked up the same way from importance (1-10)
+IMPORTANCE_THRESHOLDS = (4, 6, 8)
+IMPORTANCE_LEVELS = ("STANDARD", "MEDIUM", "HIGH", "CRITICAL")
+IMPORTANCE_COLORS = ("#64748b", "#0284c7", "#ea580c", "#dc2626")
+
+# Answer classification -> (status label, color) for the detailed breakdown
+CLASSIFICATION_STATUS = {
+    "yes": ("Pass", "#059669"),
+    "no": ("Fail", "#dc2626"),
+    "unsure": ("Partial", "#ea580c")
+}
+
 
 # Page configuration
 st.set_page_config(
@@ -353,26 +378,17 @@ def init_session_state():
 
 def get_score_class(score: float) -> str:
     """Get CSS class based on score"""
-    if score >= 80:
-        return "score-excellent"
-    elif score >= 60:
-        return "score-good"
-    elif score >= 40:
-        return "score-fair"
-    else:
-        return "score-poor"
+    return SCORE_CLASSES[bisect_right(SCORE_TIER_THRESHOLDS, score)]
 
 
 def get_score_label(score: float) -> str:
     """Get text label based on score"""
-    if score >= 80:
-        return "EXCELLENT"
-    elif score >= 60:
-        return "GOOD"
-    elif score >= 40:
-        return "FAIR"
-    else:
-        return "NEEDS IMPROVEMENT"
+    return SCORE_LABELS[bisect_right(SCORE_TIER_THRESHOLDS, score)]
+
+
+def get_importance_tier(importance: float) -> int:
+    """Get priority tier index (0=standard .. 3=critical) based on importance"""
+    return bisect_right(IMPORTANCE_THRESHOLDS, importance)
 
 
 def render_welcome_page():
@@ -462,14 +478,8 @@ def start_assessment(tool: RepositoryTool):
     st.rerun()
 
 
-def check_system_readiness():
-    """Check if Ollama is ready and initialize orchestrator"""
-    if st.session_state.orchestrator is None:
-        st.session_state.orchestrator = AssessmentOrchestrator(
-            tool=st.session_state.selected_tool
-        )
-    
-    # Run async check with proper event loop management
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the thread's event loop, creating a new one if it is missing or closed"""
     try:
         loop = asyncio.get_event_loop()
         if loop.is_closed():
@@ -478,7 +488,18 @@ def check_system_readiness():
     except RuntimeError:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+    return loop
+
+
+def check_system_readiness():
+    """Check if Ollama is ready and initialize orchestrator"""
+    if st.session_state.orchestrator is None:
+        st.session_state.orchestrator = AssessmentOrchestrator(
+            tool=st.session_state.selected_tool
+        )
     
+    # Run async check with proper event loop management
+    loop = get_event_loop()
     is_ready, message = loop.run_until_complete(
         st.session_state.orchestrator.check_readiness()
     )
@@ -500,18 +521,10 @@ def render_assessment_page():
     
     pillar_id, question, pillar_name = questions[current_idx]
     
-    # Score importance on-demand before displaying question
+    # Fallback: questions are normally scored up front during initialization
     if question.id not in orchestrator.scored_questions:
         with st.spinner(f"🤖 AI is evaluating this question's importance..."):
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
+            loop = get_event_loop()
             loop.run_until_complete(orchestrator.score_question_importance(question.id))
     
     # Progress bar
@@ -534,8 +547,9 @@ def render_assessment_page():
     """, unsafe_allow_html=True)
     
     # Question card - with priority, impact, and score displayed
-    importance_level = "CRITICAL" if question.importance >= 8 else "HIGH" if question.importance >= 6 else "MEDIUM" if question.importance >= 4 else "STANDARD"
-    importance_color = "#dc2626" if question.importance >= 8 else "#ea580c" if question.importance >= 6 else "#0284c7" if question.importance >= 4 else "#64748b"
+    importance_tier = get_importance_tier(question.importance)
+    importance_level = IMPORTANCE_LEVELS[importance_tier]
+    importance_color = IMPORTANCE_COLORS[importance_tier]
     
     st.markdown(f"""
     <div class='question-card'>
@@ -607,7 +621,7 @@ def render_assessment_page():
             st.markdown("### Recent Responses")
             recent = list(st.session_state.answers.items())[-3:]
             for q_id, result in recent:
-                status = "Pass" if result["classification"] == "yes" else "Fail" if result["classification"] == "no" else "Partial"
+                status = CLASSIFICATION_STATUS.get(result["classification"], CLASSIFICATION_STATUS["unsure"])[0]
                 st.markdown(f"**{status}**: {result['score']:.1f} pts")
 
 
@@ -619,11 +633,7 @@ def process_answer(question_id: str, answer: str):
     classification = "yes" if answer.upper() == "YES" else "no"
     
     # Find the question to get max score
-    question_data = None
-    for pid, q, pname in orchestrator.questions:
-        if q.id == question_id:
-            question_data = q
-            break
+    question_data = orchestrator.find_question(question_id)
     
     if not question_data:
         raise ValueError(f"Question {question_id} not found")
@@ -653,15 +663,14 @@ def finalize_assessment():
     # (Since max_scores changed after normalization, we need to recalculate earned points)
     for question_id, answer_data in st.session_state.answers.items():
         # Find the question to get the NEW normalized max_score
-        for pid, q, pname in orchestrator.questions:
-            if q.id == question_id:
-                # Recalculate score: YES = full normalized score, NO = 0
-                classification = answer_data["classification"]
-                score_earned = q.max_score if classification == "yes" else 0.0
-                # Update stored scores with normalized values
-                orchestrator.question_scores[question_id] = score_earned
-                answer_data["score"] = score_earned
-                break
+        q = orchestrator.find_question(question_id)
+        if q:
+            # Recalculate score: YES = full normalized score, NO = 0
+            classification = answer_data["classification"]
+            score_earned = q.max_score if classification == "yes" else 0.0
+            # Update stored scores with normalized values
+            orchestrator.question_scores[question_id] = score_earned
+            answer_data["score"] = score_earned
     
     # Calculate pillar breakdown from updated scores
     pillar_questions = {
@@ -683,19 +692,18 @@ def finalize_assessment():
     question_results = []
     for question_id, answer_data in st.session_state.answers.items():
         # Find question details
-        for pid, q, pname in orchestrator.questions:
-            if q.id == question_id:
-                from repo_scorer.models import QuestionResult
-                result = QuestionResult(
-                    question_id=question_id,
-                    question_text=q.text,
-                    user_answer=answer_data["answer"],
-                    classification=answer_data["classification"],
-                    score_earned=answer_data["score"],
-                    max_score=q.max_score
-                )
-                question_results.append(result)
-                break
+        q = orchestrator.find_question(question_id)
+        if q:
+            from repo_scorer.models import QuestionResult
+            result = QuestionResult(
+                question_id=question_id,
+                question_text=q.text,
+                user_answer=answer_data["answer"],
+                classification=answer_data["classification"],
+                score_earned=answer_data["score"],
+                max_score=q.max_score
+            )
+            question_results.append(result)
     
     # Create assessment result
     from repo_scorer.models import AssessmentResult
@@ -776,14 +784,7 @@ def render_results_page():
 
 def get_score_description(score: float) -> str:
     """Get description based on score"""
-    if score >= 80:
-        return "Excellent performance. Your repository demonstrates strong adherence to industry best practices."
-    elif score >= 60:
-        return "Good foundation established. Continue refining practices for optimal governance."
-    elif score >= 40:
-        return "Moderate implementation. Consider prioritizing critical governance practices."
-    else:
-        return "Significant improvement needed. Focus on establishing fundamental practices."
+    return SCORE_DESCRIPTIONS[bisect_right(SCORE_TIER_THRESHOLDS, score)]
 
 
 def render_pillar_chart(breakdown: Dict):
@@ -873,7 +874,7 @@ def render_gauge_chart(score: float):
 def render_detailed_breakdown(results):
     """Render detailed question-by-question breakdown"""
     # Group by pillar and deduplicate questions by ID (keep only the latest)
-    pillar_results = {}
+    pillar_results = defaultdict(list)
     seen_questions = {}  # Track latest result for each question_id
     
     # First pass: deduplicate by keeping only the last occurrence of each question
@@ -881,42 +882,24 @@ def render_detailed_breakdown(results):
         seen_questions[qr.question_id] = qr
     
     # Second pass: group by pillar using deduplicated results
+    question_index = st.session_state.orchestrator.question_index
     for qr in seen_questions.values():
-        # Find pillar name from orchestrator
-        pillar_name = None
-        for pid, q, pname in st.session_state.orchestrator.questions:
-            if q.id == qr.question_id:
-                pillar_name = pname
-                break
-        
-        if pillar_name:
-            if pillar_name not in pillar_results:
-                pillar_results[pillar_name] = []
-            pillar_results[pillar_name].append(qr)
+        # Find pillar name and question details (for importance/priority display) from orchestrator
+        entry = question_index.get(qr.question_id)
+        if entry:
+            pillar_results[entry.pillar_name].append((qr, entry.question))
     
     # Render each pillar
     for pillar_name, questions in pillar_results.items():
         with st.expander(f"{pillar_name}", expanded=False):
-            for qr in questions:
-                # Get question details for importance/priority display
-                question_obj = None
-                for pid, q, pname in st.session_state.orchestrator.questions:
-                    if q.id == qr.question_id:
-                        question_obj = q
-                        break
-                
-                classification_status = {
-                    "yes": ("Pass", "#059669"),
-                    "no": ("Fail", "#dc2626"),
-                    "unsure": ("Partial", "#ea580c")
-                }
-                
-                status, color = classification_status.get(qr.classification, ("Unknown", "#64748b"))
+            for qr, question_obj in questions:
+                status, color = CLASSIFICATION_STATUS.get(qr.classification, ("Unknown", "#64748b"))
                 percentage = (qr.score_earned / qr.max_score * 100) if qr.max_score > 0 else 0
                 
                 # Importance display
-                importance_level = "Critical" if question_obj and question_obj.importance >= 8 else "High" if question_obj and question_obj.importance >= 6 else "Medium" if question_obj and question_obj.importance >= 4 else "Standard"
-                importance_color = "#dc2626" if question_obj and question_obj.importance >= 8 else "#ea580c" if question_obj and question_obj.importance >= 6 else "#0284c7" if question_obj and question_obj.importance >= 4 else "#64748b"
+                importance_tier = get_importance_tier(question_obj.importance)
+                importance_level = IMPORTANCE_LEVELS[importance_tier].title()
+                importance_color = IMPORTANCE_COLORS[importance_tier]
                 
                 st.markdown(f"""
                 <div style='background: #f8fafc; padding: 1.5rem; border-radius: 8px; 
@@ -995,6 +978,10 @@ def show_summary():
 
 def reset_assessment():
     """Reset all session state"""
+    orchestrator = st.session_state.get("orchestrator")
+    if orchestrator is not None:
+        # Release the Ollama connection before the orchestrator is dropped
+        get_event_loop().run_until_complete(orchestrator.ollama.close())
     st.session_state.clear()
     init_session_state()
 
@@ -1066,8 +1053,11 @@ def main():
         if is_ready:
             st.success("✓ " + message)
             with st.spinner("AI is analyzing question importance... This may take a few minutes."):
-                # The importance weighting is done in check_readiness
-                pass
+                # Score all questions up front in one bulk request so the assessment page doesn't wait per question
+                loop = get_event_loop()
+                loop.run_until_complete(
+                    st.session_state.orchestrator.score_all_question_importance()
+                )
             st.success("✓ Question importance weights assigned")
             st.session_state.stage = "assessment"
             st.session_state.system_ready = True